@@ -6,20 +6,36 @@ SpeechRecognition STT + Cartesia Sonic 3 TTS
 import os
 import io
 import time
+import socket
+import hashlib
+import threading
 import argparse
+from collections import OrderedDict
 import numpy as np
 import gradio as gr
+import requests
+from requests.adapters import HTTPAdapter
 import speech_recognition as sr
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from loguru import logger
 import re
+import soxr
 from cartesia import Cartesia
 from fastrtc import AlgoOptions, ReplyOnPause, Stream
-from scripts.agent import agent, agent_config
 
 load_dotenv()
 
+def get_agent():
+    """
+    Import the LangGraph agent on first use (LangChain, Cerebras and all tools)
+    """
+    from scripts.agent import voice_agent, voice_agent_config
+    return voice_agent, voice_agent_config
+
+# Load the agent in the background so the UI and TTS warm-up don't wait on it
+threading.Thread(target=get_agent, daemon=True).start()
+
 # ----------------------------- CLEAN + COLORED LOGGER ---------------------------------
 
 logger.remove()
@@ -46,23 +62,50 @@ RESET = "\033[0m"
 
 # ----------------------------- TEXT CLEANER FOR TTS ------------------------------------
 
+# Markdown symbols are dropped and table pipes become spaces in one C-level pass
+MD_TRANSLATION = str.maketrans({"*": None, "#": None, "_": None, "`": None, "|": " "})
+# Dash rules and whitespace runs collapse to a single space
+RE_DASHES_OR_WHITESPACE = re.compile(r'(?:-{2,}|\s)+')
+
 def clean_text_for_tts(text: str) -> str:
     """
     Clean markdown formatting for better TTS output.
     """
-    clean_text = text
-    clean_text = re.sub(r'\*+', '', clean_text)
-    clean_text = re.sub(r'[#_`]', '', clean_text)
-    clean_text = re.sub(r'-{2,}', ' ', clean_text)
-    clean_text = re.sub(r'\|', ' ', clean_text)
-    clean_text = re.sub(r'\s+', ' ', clean_text).strip()
+    clean_text = text.translate(MD_TRANSLATION)
+    clean_text = RE_DASHES_OR_WHITESPACE.sub(' ', clean_text).strip()
     return clean_text
 
 # ----------------------------- INIT CLIENTS --------------------------------------------
 
 logger.info(f"{CYAN}🎙 Initializing SpeechRecognition + Cartesia Sonic-3 TTS..{RESET}")
 
-recognizer = sr.Recognizer()
+# No Nagle delay on the request tail, and TCP keepalive so NATs don't drop the idle socket
+STT_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+class STTAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = STT_SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+# One pooled session so every utterance reuses the same keep-alive connection
+stt_session = requests.Session()
+stt_session.mount("http://", STTAdapter())
+stt_session.mount("https://", STTAdapter())
+
+try:
+    # SpeechRecognition's Google internals (>=3.11) let the request go through stt_session
+    from speech_recognition.recognizers import google as google_stt
+    stt_request_builder = google_stt.create_request_builder(endpoint=google_stt.ENDPOINT)
+    stt_output_parser = google_stt.OutputParser(show_all=False, with_confidence=False)
+except (ImportError, AttributeError, TypeError):
+    # Internals moved in this release: fall back to the public client (no pooling)
+    logger.warning("SpeechRecognition internals unavailable; using recognize_google without connection pooling")
+    stt_request_builder = stt_output_parser = None
+
+stt_recognizer = sr.Recognizer()
 
 cartesia_client = Cartesia(api_key=os.getenv("CARTESIA_API_KEY"))
 
@@ -75,65 +118,231 @@ CARTESIA_TTS_CONFIG = {
     "output_format": {
         "container": "raw",
         "sample_rate": 24000,
-        "encoding": "pcm_f32le",
+        "encoding": "pcm_s16le",  # half the bytes of pcm_f32le; FastRTC plays int16 as-is
     },
 }
 
+# Smallest frame handed to FastRTC (20 ms); tinier network chunks are batched up
+MIN_EMIT_SAMPLES = CARTESIA_TTS_CONFIG["output_format"]["sample_rate"] // 50
+
+STT_SAMPLE_RATE = 16000
+
 # ----------------------------- FUNCTIONS ------------------------------------
 
-def stt_transcribe(audio):
+def preprocess_audio(audio):
     """
-    Convert audio → text (SpeechRecognition STT)
+    Downmix to mono and resample to STT_SAMPLE_RATE (int16 PCM)
     """
     sample_rate, audio_array = audio
 
-    if audio_array.dtype == np.float32:
-        audio_int16 = (audio_array * 32767).astype(np.int16)
+    if audio_array.dtype == np.int16 and audio_array.size == audio_array.shape[-1]:
+        # Mono int16 (FastRTC's capture format): soxr resamples int16 → int16
+        # in one pass and saturates in C, so no float round trip is needed
+        audio_int16 = audio_array.reshape(-1)
+        if sample_rate != STT_SAMPLE_RATE:
+            audio_int16 = soxr.resample(audio_int16, sample_rate, STT_SAMPLE_RATE, quality="HQ")
+        return STT_SAMPLE_RATE, audio_int16
+
+    if audio_array.ndim > 1:
+        # FastRTC frames are (channels, samples): average channels in one fused pass
+        audio_float = audio_array.mean(axis=0, dtype=np.float32)
     else:
-        audio_int16 = audio_array.astype(np.int16)
+        audio_float = audio_array.astype(np.float32, copy=False)
+
+    if np.issubdtype(audio_array.dtype, np.integer):
+        # Integer PCM → [-1, 1] (audio_float is always a fresh array here);
+        # float input is taken as already normalised
+        audio_float *= 1.0 / (np.iinfo(audio_array.dtype).max + 1)
+
+    # libsoxr copies strided input internally; hand it contiguous memory
+    audio_float = np.ascontiguousarray(audio_float)
+
+    if sample_rate != STT_SAMPLE_RATE:
+        audio_float = soxr.resample(audio_float, sample_rate, STT_SAMPLE_RATE, quality="HQ")
+
+    # Scale in place when we own the buffer, and saturate instead of wrapping
+    scaled = audio_float if audio_float is not audio_array else np.empty_like(audio_float)
+    np.multiply(audio_float, 32767.0, out=scaled)
+    np.clip(scaled, -32768.0, 32767.0, out=scaled)
+    return STT_SAMPLE_RATE, scaled.astype(np.int16)
+
+def recognize_google(audio_data):
+    """
+    Google Web Speech request over the persistent STT session
+    """
+    if stt_request_builder is None:
+        return stt_recognizer.recognize_google(audio_data)
+
+    url = stt_request_builder.build_url()
+    headers = stt_request_builder.build_headers(audio_data)
+    data = stt_request_builder.build_data(audio_data)
 
-    if audio_int16.ndim > 1:
-        audio_int16 = audio_int16.flatten()
+    # A pooled connection may have been dropped while idle: reconnect once
+    for attempt in range(2):
+        try:
+            resp = stt_session.post(url, data=data, headers=headers)
+            break
+        except requests.ConnectionError:
+            if attempt:
+                raise
+
+    resp.raise_for_status()
+    return stt_output_parser.parse(resp.text)
+
+def stt_transcribe(audio):
+    """
+    Convert audio → text (SpeechRecognition STT)
+    """
+    sample_rate, audio_int16 = preprocess_audio(audio)
 
     audio_bytes = audio_int16.tobytes()
     audio_data = sr.AudioData(audio_bytes, sample_rate, 2)
 
     try:
-        return recognizer.recognize_google(audio_data)
+        return recognize_google(audio_data)
     except:
         return ""
 
-def generate_speech(text):
-    iter_chunks = cartesia_client.tts.bytes(
+# ----------------------------- TTS CACHE ------------------------------------
+
+# Repeated phrases (greetings, "let me check", errors) skip synthesis entirely
+TTS_CACHE_MAX_BYTES = 128 * 1024 * 1024
+TTS_CACHE_SLICE_BYTES = 4096  # ~85 ms of 24 kHz int16 per frame on a cache hit
+
+tts_cache = OrderedDict()  # key → raw PCM bytes, least recently used first
+tts_cache_bytes = 0
+tts_cache_lock = threading.Lock()
+
+def tts_cache_key(text):
+    output_format = CARTESIA_TTS_CONFIG["output_format"]
+    raw = "|".join([
+        text,
+        CARTESIA_TTS_CONFIG["model_id"],
+        CARTESIA_TTS_CONFIG["voice"]["id"],
+        output_format["encoding"],
+        str(output_format["sample_rate"]),
+    ])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def tts_cache_get(key):
+    with tts_cache_lock:
+        audio = tts_cache.get(key)
+        if audio is not None:
+            tts_cache.move_to_end(key)
+        return audio
+
+def tts_cache_put(key, audio):
+    global tts_cache_bytes
+    with tts_cache_lock:
+        if key in tts_cache or len(audio) > TTS_CACHE_MAX_BYTES:
+            return
+        tts_cache[key] = audio
+        tts_cache_bytes += len(audio)
+        while tts_cache_bytes > TTS_CACHE_MAX_BYTES:
+            _, evicted = tts_cache.popitem(last=False)
+            tts_cache_bytes -= len(evicted)
+
+def synthesize(text):
+    """
+    Yield raw PCM bytes for text, from the cache when possible
+    """
+    key = tts_cache_key(text)
+    audio = tts_cache_get(key)
+    if audio is not None:
+        # Replay in network-sized slices so cached audio is framed like live audio
+        view = memoryview(audio)
+        for start in range(0, len(view), TTS_CACHE_SLICE_BYTES):
+            yield view[start:start + TTS_CACHE_SLICE_BYTES]
+        return
+
+    parts = []
+    for chunk in cartesia_client.tts.bytes(
         model_id=CARTESIA_TTS_CONFIG["model_id"],
         transcript=text,
         voice=CARTESIA_TTS_CONFIG["voice"],
         output_format=CARTESIA_TTS_CONFIG["output_format"],
-    )
+    ):
+        parts.append(chunk)
+        yield chunk
+
+    # Only complete streams are cached (an interrupted reply never gets here)
+    tts_cache_put(key, b"".join(parts))
+
+def generate_speech(text):
+    iter_chunks = synthesize(text)
 
-    buffer = b""
-    element_size = 4
+    # Mutable buffer: appending and trimming don't re-copy the accumulated bytes
+    buffer = bytearray()
+    dtype = np.int16  # matches "pcm_s16le"
+    element_size = np.dtype(dtype).itemsize
+    min_bytes = MIN_EMIT_SAMPLES * element_size
     sample_rate = CARTESIA_TTS_CONFIG["output_format"]["sample_rate"]
 
     for chunk in iter_chunks:
-        buffer += chunk
-        n = len(buffer) // element_size
+        if not buffer and len(chunk) >= min_bytes and len(chunk) % element_size == 0:
+            # Aligned chunk with nothing pending: wrap the (immutable) bytes, no copy
+            yield (sample_rate, np.frombuffer(chunk, dtype=dtype))
+            continue
 
-        if n:
-            size = n * element_size
-            block = buffer[:size]
-            buffer = buffer[size:]
+        buffer += chunk
+        if len(buffer) < min_bytes:
+            continue
 
-            arr = np.frombuffer(block, dtype=np.float32)
-            yield (sample_rate, arr)
+        # Hand the filled bytearray to NumPy as the frame's storage (no copy)
+        # and carry only the trailing partial sample into a fresh buffer
+        rem = len(buffer) % element_size
+        block, buffer = buffer, bytearray(buffer[len(buffer) - rem:])
+        if rem:
+            del block[-rem:]
+        yield (sample_rate, np.frombuffer(block, dtype=dtype))
 
     if buffer:
         rem = len(buffer) % element_size
         if rem:
             buffer += b"\x00" * (element_size - rem)
-        arr = np.frombuffer(buffer, dtype=np.float32)
+        arr = np.frombuffer(buffer, dtype=dtype)
         yield (sample_rate, arr)
 
+# ----------------------------- LLM STREAMING ------------------------------------
+
+# Speak the reply a sentence at a time while the LLM is still generating
+RE_SENTENCE_END = re.compile(r'[.!?]+\s|\n')
+MIN_SENTENCE_CHARS = 40
+
+def stream_reply(transcript):
+    """
+    Yield the agent's reply text token by token
+    """
+    agent, agent_config = get_agent()
+
+    for message, metadata in agent.stream(
+        {"messages": [{"role": "user", "content": transcript}]},
+        config=agent_config,
+        stream_mode="messages",
+    ):
+        # Skip tool outputs; only the model's own text is spoken
+        if metadata.get("langgraph_node") == "agent" and isinstance(message.content, str):
+            yield message.content
+
+def iter_sentences(tokens):
+    """
+    Group streamed tokens into sentences of at least MIN_SENTENCE_CHARS
+    """
+    pending = ""
+    for token in tokens:
+        pending += token
+
+        end = 0
+        for match in RE_SENTENCE_END.finditer(pending, MIN_SENTENCE_CHARS - 1):
+            end = match.end()
+
+        if end:
+            yield pending[:end]
+            pending = pending[end:]
+
+    if pending.strip():
+        yield pending
+
 # ----------------------------- MAIN PIPELINE ------------------------------------
 
 def response(audio):
@@ -150,44 +359,66 @@ def response(audio):
     if not transcript.strip():
         return
 
-    # --- LLM ---
-    llm_start = time.time()
-    agent_reply = agent.invoke(
-        {"messages": [{"role": "user", "content": transcript}]},
-        config=agent_config,
-    )
-
-    reply_raw = agent_reply["messages"][-1].content
-    llm_time = time.time() - llm_start
-
-    logger.info(f'{MAGENTA}💬 Response: "{reply_raw}"{RESET}')
+    # --- LLM → TTS (pipelined per sentence) ---
+    reply_start = time.time()
+    first_audio_time = None
+    reply_parts = []
+    chunk_count = 0
 
-    # Clean for TTS only
-    reply_clean = clean_text_for_tts(reply_raw)
+    for sentence in iter_sentences(stream_reply(transcript)):
+        reply_parts.append(sentence)
 
-    # --- TTS ---
-    logger.info(f"{GREEN}🔊 Speaking...{RESET}")
+        # Clean for TTS only
+        sentence_clean = clean_text_for_tts(sentence)
+        if not sentence_clean:
+            continue
 
-    tts_start = time.time()
-    chunk_count = 0
+        if first_audio_time is None:
+            logger.info(f"{GREEN}🔊 Speaking...{RESET}")
 
-    for chunk in generate_speech(reply_clean):
-        chunk_count += 1
-        yield chunk
+        for chunk in generate_speech(sentence_clean):
+            if first_audio_time is None:
+                first_audio_time = time.time() - start_time
+            chunk_count += 1
+            yield chunk
 
-    tts_time = time.time() - tts_start
+    reply_time = time.time() - reply_start
     total_time = time.time() - start_time
 
+    logger.info(f'{MAGENTA}💬 Response: "{"".join(reply_parts).strip()}"{RESET}')
+
     # --- PERFORMANCE LOG ---
     logger.info(
         f"{CYAN}⚡ Performance:{RESET} "
         f"{YELLOW}STT={stt_time:.2f}s{RESET} | "
-        f"{MAGENTA}LLM={llm_time:.2f}s{RESET} | "
-        f"{GREEN}TTS={tts_time:.2f}s{RESET} | "
+        f"{MAGENTA}LLM+TTS={reply_time:.2f}s{RESET} | "
+        f"{GREEN}FirstAudio={first_audio_time or 0:.2f}s{RESET} | "
         f"{CYAN}Total={total_time:.2f}s{RESET} | "
         f"{RED}Chunks={chunk_count}{RESET}"
     )
 
+# ----------------------------- WARM-UP ------------------------------------
+
+def warm_up():
+    """
+    Pay DNS/TCP/TLS + first-synthesis cost before the first user turn
+    """
+    try:
+        for _ in cartesia_client.tts.bytes(
+            model_id=CARTESIA_TTS_CONFIG["model_id"],
+            transcript="Hi.",
+            voice=CARTESIA_TTS_CONFIG["voice"],
+            output_format=CARTESIA_TTS_CONFIG["output_format"],
+        ):
+            pass
+        # Leaves a keep-alive connection to the STT host in the session pool
+        if stt_request_builder is not None:
+            stt_session.head(stt_request_builder.endpoint)
+    except Exception:
+        pass  # best effort; the first turn just pays the cost instead
+
+threading.Thread(target=warm_up, daemon=True).start()
+
 # ----------------------------- STREAM SETUP ------------------------------------
 
 def create_stream():
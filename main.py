@@ -3,22 +3,15 @@ Streamlit UI for Voice Agent
 Combined chat interface and document ingestion
 """
 
-import os
 import base64
 import streamlit as st
 from dotenv import load_dotenv
 from scripts.agent import agent, agent_config
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_chroma import Chroma
+from scripts.ingestion import parse_pdfs
+from scripts.vectorstore import add_chunks
 
 load_dotenv()
 
-# Configuration
-CHROMA_PATH = "chroma_db"
-EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
-
 # Page configuration
 st.set_page_config(
     page_title="Samantha",
@@ -124,45 +117,17 @@ with tab2:
     if uploaded_files:
         if st.button("🚀 Ingest Documents", type="primary"):
             with st.spinner("Processing documents..."):
-                total_chunks = 0
+                st.write(f"📖 Processing **{len(uploaded_files)}** file(s)...")
+                parsed = parse_pdfs([(file.name, file.getvalue()) for file in uploaded_files])
+                
+                all_chunks = []
+                for file, chunks in zip(uploaded_files, parsed, strict=True):
+                    all_chunks.extend(chunks)
+                    st.success(f"✅ **{file.name}**: Split into {len(chunks)} chunks")
                 
-                for file in uploaded_files:
-                    st.write(f"📖 Processing **{file.name}**...")
-                    
-                    # Save uploaded file temporarily
-                    temp_file = f"./temp_{file.name}"
-                    with open(temp_file, "wb") as f:
-                        f.write(file.getbuffer())
-                    
-                    try:
-                        # Load PDF
-                        loader = PyPDFLoader(temp_file)
-                        docs = loader.load()
-                        
-                        # Split into chunks
-                        text_splitter = RecursiveCharacterTextSplitter(
-                            chunk_size=1000,
-                            chunk_overlap=200,
-                            add_start_index=True,
-                        )
-                        chunks = text_splitter.split_documents(docs)
-                        
-                        # Save to ChromaDB
-                        embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
-                        Chroma.from_documents(
-                            documents=chunks,
-                            embedding=embeddings,
-                            persist_directory=CHROMA_PATH
-                        )
-                        
-                        count = len(chunks)
-                        total_chunks += count
-                        st.success(f"✅ **{file.name}**: Added {count} chunks")
-                        
-                    finally:
-                        # Clean up temp file
-                        if os.path.exists(temp_file):
-                            os.remove(temp_file)
+                # Save to ChromaDB (same store the database tool searches)
+                add_chunks(all_chunks)
+                total_chunks = len(all_chunks)
                 
                 st.success(f"🎉 **All done!** Total {total_chunks} chunks added to ChromaDB.")
                 st.balloons()
@@ -1,16 +1,22 @@
 import os
+import sqlite3
 from dotenv import load_dotenv
 from loguru import logger
 from langchain_cerebras import ChatCerebras
-from langgraph.checkpoint.memory import InMemorySaver
+from langchain_core.messages import RemoveMessage, trim_messages
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
 from langgraph.prebuilt import create_react_agent
 
 # Import tools from the new tools package
 from tools.tavily_tool import tavily_tool
-from tools.stock_tools import get_stock_price, get_company_info
+from tools.stock_tools import get_stock_price, get_company_info, get_stocks_bulk
 from tools.weather_tool import get_weather
 from tools.flight_tool import search_flights
 from tools.hotel_tool import search_hotels
+from tools.trip_tool import plan_trip
 from tools.database_tool import database_search
 
 
@@ -19,12 +25,24 @@ load_dotenv()
 # ==========================
 # 1. LLM MODEL (CEREBRAS)
 # ==========================
-model = ChatCerebras(
-    model="gpt-oss-120b",      # Low latency, strong model
-    max_tokens=512,
-    api_key=os.getenv("CEREBRAS_API_KEY"),
-    temperature=0.7,
-)
+# gpt-oss-120b is a reasoning model: max_tokens covers its reasoning and any
+# tool-call JSON as well as the reply, so these leave headroom for both.
+# Voice brevity comes from the prompt ("Be brief."), not from a tight cap.
+MAX_TOKENS = 512
+VOICE_MAX_TOKENS = 256
+
+
+def build_model(max_tokens: int = MAX_TOKENS) -> ChatCerebras:
+    return ChatCerebras(
+        model="gpt-oss-120b",      # Low latency, strong model
+        max_tokens=max_tokens,
+        api_key=os.getenv("CEREBRAS_API_KEY"),
+        temperature=0.7,
+        reasoning_effort="low",    # fewer hidden tokens before the first spoken one
+        streaming=True,            # tokens reach TTS as soon as they're generated
+    )
+
+model = build_model()
 
 # ==========================
 # 2. REGISTER ALL TOOLS
@@ -33,47 +51,108 @@ tools = [
     tavily_tool,
     get_stock_price,
     get_company_info,
+    get_stocks_bulk,
     get_weather,
     search_flights,
     search_hotels,
+    plan_trip,
     database_search,
     
 
 ]
 
+# JSON schemas are derived from the tool signatures once per process and
+# shared by every agent variant instead of being rebuilt for each one
+TOOL_SCHEMAS = [convert_to_openai_tool(t) for t in tools]
+
 # ==========================
 # 3. SYSTEM PROMPT
 # ==========================
-system_prompt = """
-You are Samantha, a helpful AI agent.
-Use TavilySearch for general or current information.
-Use YFinance tools for stock prices and company financials.
-Use Weather tool for current weather.
-Use Flights tool for flight options with the help of SerpAPI.
-Use Hotels tool for hotel options with the help of SerpAPI.
-Use Database tool for questions about uploaded documents, manuals, or specific internal knowledge.
-Keep responses short, natural, and suitable for voice interaction.
-"""
+# Built once at import; every saved token is prompt processing Cerebras skips
+system_prompt = (
+    "You are Samantha. Tools: TavilySearch (web), YFinance (stocks), Weather, "
+    "Flights/Hotels (Kayak), Trip (flights + hotels together), Database (uploaded documents). "
+    "Reply short and voice-ready."
+)
+
+PROMPT = ChatPromptTemplate.from_messages([
+    ("system", system_prompt),
+    MessagesPlaceholder("messages"),
+])
+
+VOICE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", system_prompt + " Be brief."),
+    MessagesPlaceholder("messages"),
+])
 
 # ==========================
 # 4. MEMORY
 # ==========================
-memory = InMemorySaver()
+# Persistent across restarts; each thread keeps only its recent history.
+# main.py and app.py share this file but use separate threads (see configs below);
+# SQLite's file locking keeps writes from the two processes apart.
+AGENT_DB_PATH = "agent.db"
+MAX_HISTORY_MESSAGES = 20
+
+memory = SqliteSaver(sqlite3.connect(AGENT_DB_PATH, check_same_thread=False))
+
+
+def trim_history(state):
+    """
+    Runs before every LLM call: drop all but the last MAX_HISTORY_MESSAGES
+    messages from the thread, which bounds the prompt sent to Cerebras and
+    the history kept per thread.
+    """
+    messages = state["messages"]
+    if len(messages) > MAX_HISTORY_MESSAGES:
+        trimmed = trim_messages(
+            messages,
+            strategy="last",
+            token_counter=len,
+            max_tokens=MAX_HISTORY_MESSAGES,
+            start_on="human",  # never start on an orphaned tool result
+        )
+        if trimmed:
+            # llm_input_messages is checkpointed too, so it must be refreshed
+            # here or the model keeps seeing the previous turn's snapshot
+            return {
+                "messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *trimmed],
+                "llm_input_messages": trimmed,
+            }
+    return {"llm_input_messages": messages}
 
 # ==========================
 # 5. BUILD THE AGENT
 # ==========================
-# pyrefly: ignore [deprecated]
-agent = create_react_agent(
-    model=model,
-    tools=tools,
-    prompt=system_prompt,
-    checkpointer=memory,
-)
+def build_agent(voice: bool = False):
+    """
+    Build the ReAct agent. `voice=True` caps replies at VOICE_MAX_TOKENS and
+    asks for brevity, for the speech pipeline where every token is spoken.
+    Both variants share the same memory.
+    """
+    llm = build_model(VOICE_MAX_TOKENS) if voice else model
+    # pyrefly: ignore [deprecated]
+    return create_react_agent(
+        model=llm.bind_tools(TOOL_SCHEMAS),  # already bound, so LangGraph skips re-binding
+        tools=tools,
+        prompt=VOICE_PROMPT if voice else PROMPT,
+        checkpointer=memory,
+        pre_model_hook=trim_history,
+    )
+
+agent = build_agent()
+voice_agent = build_agent(voice=True)
 
-# Config
+# Config (text chat in main.py)
 agent_config = {
     "configurable": {
         "thread_id": "default_user"
     }
 }
+
+# Voice conversations (app.py) get their own thread so they don't mix with chat
+voice_agent_config = {
+    "configurable": {
+        "thread_id": "voice_user"
+    }
+}
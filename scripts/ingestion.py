@@ -0,0 +1,54 @@
+import os
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from langchain_community.document_loaders import PyPDFLoader
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+# ==========================
+# PDF PARSING (shared by ingest.py and main.py)
+# ==========================
+
+def parse_pdf_bytes(name: str, data: bytes):
+    """
+    Load one PDF from raw bytes and split it into chunks.
+    Runs inside a worker process, so it only touches its own temp directory.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_file = os.path.join(temp_dir, os.path.basename(name))
+        with open(temp_file, "wb") as f:
+            f.write(data)
+
+        loader = PyPDFLoader(temp_file)
+        docs = loader.load()
+
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=1000,
+        chunk_overlap=200,
+        add_start_index=True,
+    )
+    return text_splitter.split_documents(docs)
+
+
+def parse_pdfs(files):
+    """
+    Parse uploaded PDFs in parallel, one worker process per file (up to CPU count).
+    A single file is parsed in-process.
+
+    Args:
+        files: List of (file name, file bytes) pairs.
+
+    Returns:
+        A list of chunk lists, in the same order as `files`.
+    """
+    if len(files) <= 1:
+        # Nothing to overlap: a spawned worker would only re-import langchain
+        return [parse_pdf_bytes(name, data) for name, data in files]
+
+    names, blobs = zip(*files, strict=True)
+    # spawn, not fork: the parent (Streamlit + torch) is multi-threaded
+    with ProcessPoolExecutor(
+        max_workers=min(len(files), os.cpu_count() or 1),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        return list(executor.map(parse_pdf_bytes, names, blobs))
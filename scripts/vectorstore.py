@@ -0,0 +1,54 @@
+import threading
+
+# ==========================
+# SHARED VECTOR STORE (used by ingest.py, main.py and the database tool)
+# ==========================
+
+CHROMA_PATH = "chroma_db"
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"  # 384 dimensions
+EMBEDDING_BATCH_SIZE = 64
+CHROMA_BATCH_SIZE = 5000  # stays under Chroma's max records per upsert
+
+# One embedding model and one Chroma handle per process, however many
+# callers (Streamlit reruns, agent tool threads) ask for them
+_embeddings = None
+_db = None
+_lock = threading.Lock()
+
+
+def get_embeddings():
+    """Load the embedding model on first use and reuse it."""
+    global _embeddings
+    with _lock:
+        if _embeddings is None:
+            # Imported here so the vector store stack only loads when it's needed
+            from langchain_huggingface import HuggingFaceEmbeddings
+            _embeddings = HuggingFaceEmbeddings(
+                model_name=EMBEDDING_MODEL,
+                encode_kwargs={"batch_size": EMBEDDING_BATCH_SIZE},
+            )
+    return _embeddings
+
+
+def get_db():
+    """
+    Open the persistent ChromaDB collection on first use and reuse it.
+    Creates the database in CHROMA_PATH if it doesn't exist.
+    """
+    global _db
+    embeddings = get_embeddings()
+    with _lock:
+        if _db is None:
+            from langchain_chroma import Chroma
+            _db = Chroma(
+                persist_directory=CHROMA_PATH,
+                embedding_function=embeddings,
+            )
+    return _db
+
+
+def add_chunks(chunks):
+    """Add document chunks to ChromaDB in as few (large) batches as possible."""
+    db = get_db()
+    for start in range(0, len(chunks), CHROMA_BATCH_SIZE):
+        db.add_documents(chunks[start:start + CHROMA_BATCH_SIZE])
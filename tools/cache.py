@@ -0,0 +1,57 @@
+import threading
+from cachetools import TTLCache
+
+# ==========================
+# TOOL RESULT CACHES
+# ==========================
+# Repeated questions within a TTL are answered without another upstream round-trip.
+
+shop_cache = TTLCache(maxsize=512, ttl=600)        # key: (query, num_results)
+weather_cache = TTLCache(maxsize=256, ttl=300)     # key: city
+stock_cache = TTLCache(maxsize=1024, ttl=30)       # key: TICKER
+company_cache = TTLCache(maxsize=2048, ttl=86400)  # key: TICKER
+
+_lock = threading.Lock()
+_MISSING = object()
+
+
+def cached(cache: TTLCache, key, compute):
+    """
+    Return `cache[key]`, calling `compute()` and storing its result on a miss.
+    Exceptions from `compute` propagate and nothing is cached.
+    """
+    with _lock:
+        value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    value = compute()
+    with _lock:
+        cache[key] = value
+    return value
+
+
+def get_many(cache: TTLCache, keys) -> tuple:
+    """Split `keys` into a dict of cached values and a list of missing keys."""
+    found, missing = {}, []
+    with _lock:
+        for key in keys:
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+    return found, missing
+
+
+def put_many(cache: TTLCache, values: dict):
+    """Store several freshly computed values at once."""
+    with _lock:
+        cache.update(values)
+
+
+def clear_tool_caches():
+    """Drop every cached tool result."""
+    with _lock:
+        for cache in (shop_cache, weather_cache, stock_cache, company_cache):
+            cache.clear()
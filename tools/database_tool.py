@@ -1,15 +1,10 @@
 import os
 from langchain.tools import tool
-from langchain_chroma import Chroma
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_groq import ChatGroq
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from loguru import logger
-
-# Configuration
-CHROMA_PATH = "chroma_db"
-EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"  # 384 dimensions
+from scripts.vectorstore import CHROMA_PATH, get_db
 
 # Initialize Low-Temp Model for RAG (Temperature 0.2 as requested)
 rag_llm = ChatGroq(
@@ -34,16 +29,11 @@ def database_search(query: str) -> str:
     try:
         logger.info(f"🔍 Searching database for: {query}")
         
-        embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
-        
         # Initialize Chroma client
         if not os.path.exists(CHROMA_PATH):
             return "❌ Database not found. Please upload documents using the ingestion app first."
             
-        db = Chroma(
-            persist_directory=CHROMA_PATH, 
-            embedding_function=embeddings
-        )
+        db = get_db()
         
         # Search for top 3 relevant chunks
         results = db.similarity_search(query, k=3)
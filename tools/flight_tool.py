@@ -1,11 +1,55 @@
-import os
-from dotenv import load_dotenv
 from langchain.tools import tool
-from langchain_community.document_loaders.firecrawl import FireCrawlLoader
 from loguru import logger
 from typing import Optional
+from tools.http_client import run
+from tools.scraper import firecrawl_scrape
+from tools.travel import check_dates, clean_location
+
+
+def build_flights_url(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    return_date: Optional[str] = None
+) -> str:
+    """Build the Kayak flights search URL."""
+    origin_clean = clean_location(origin)
+    dest_clean = clean_location(destination)
+    
+    if return_date:
+        return f"https://www.kayak.com/flights/{origin_clean}-{dest_clean}/{departure_date}/{return_date}"
+    return f"https://www.kayak.com/flights/{origin_clean}-{dest_clean}/{departure_date}"
+
+
+def format_flights(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    return_date: Optional[str],
+    url: str,
+    content: str
+) -> str:
+    """Format scraped Kayak flight results for the agent."""
+    if not content:
+        return f"❌ Could not fetch flight data from Kayak for {origin} to {destination}"
+    
+    # Format output
+    parts = [
+        f"✈️ *Flights from {origin} to {destination}*",
+        f"📅 Departure: {departure_date}",
+    ]
+    if return_date:
+        parts.append(f"📅 Return: {return_date}")
+    parts += [
+        "",
+        "--- Extracted Content ---",
+        content,  # already trimmed by firecrawl_scrape
+        "",
+        f"🔗 Full details: {url}",
+    ]
+    
+    return "\n".join(parts)
 
-load_dotenv()
 
 @tool
 def search_flights(
@@ -26,44 +70,18 @@ def search_flights(
     Returns:
         Formatted flight information from Kayak
     """
+    error = check_dates(departure_date, return_date)
+    if error:
+        return error
+
     try:
-        # Build Kayak URL
-        origin_clean = origin.replace(" ", "-")
-        dest_clean = destination.replace(" ", "-")
-        
-        if return_date:
-            url = f"https://www.kayak.com/flights/{origin_clean}-{dest_clean}/{departure_date}/{return_date}"
-        else:
-            url = f"https://www.kayak.com/flights/{origin_clean}-{dest_clean}/{departure_date}"
+        url = build_flights_url(origin, destination, departure_date, return_date)
         
         logger.info(f"Scraping Kayak flights: {url}")
         
-        # Use FireCrawlLoader from LangChain
-        loader = FireCrawlLoader(
-            api_key=os.getenv("FIRECRAWL_API_KEY"),
-            url=url,
-            mode="scrape"
-        )
-        
-        docs = loader.load()
-        
-        if not docs:
-            return f"❌ Could not fetch flight data from Kayak for {origin} to {destination}"
-        
-        doc = docs[0]
-        content = doc.page_content
-        metadata = doc.metadata
-        
-        # Format output
-        output = f"✈️ *Flights from {origin} to {destination}*\n"
-        output += f"📅 Departure: {departure_date}\n"
-        if return_date:
-            output += f"📅 Return: {return_date}\n"
-        output += f"\n--- Extracted Content ---\n"
-        output += f"{content[:2500]}\n\n"  # Limit content
-        output += f"🔗 Full details: {url}"
+        content, _ = run(firecrawl_scrape(url))
         
-        return output
+        return format_flights(origin, destination, departure_date, return_date, url, content)
         
     except Exception as e:
         logger.error(f"Error scraping flights: {e}")
@@ -1,10 +1,52 @@
-import os
-from dotenv import load_dotenv
 from langchain.tools import tool
-from langchain_community.document_loaders.firecrawl import FireCrawlLoader
 from loguru import logger
+from tools.http_client import run
+from tools.scraper import firecrawl_scrape
+from tools.travel import check_dates, clean_location
+
+
+def build_hotels_url(location: str, check_in: str, check_out: str, guests: int = 2) -> str:
+    """Build the Kayak hotels search URL."""
+    location_clean = clean_location(location)
+    return f"https://www.kayak.com/hotels/{location_clean}/{check_in}/{check_out}/{guests}adults"
+
+
+def format_hotels(
+    location: str,
+    check_in: str,
+    check_out: str,
+    guests: int,
+    url: str,
+    content: str,
+    metadata: dict
+) -> str:
+    """Format scraped Kayak hotel results for the agent."""
+    if not content:
+        return f"❌ Could not fetch hotel data from Kayak for {location}"
+    
+    # Format output
+    parts = [
+        f"🏨 *Hotels in {location}*",
+        f"📅 Check-in: {check_in}",
+        f"📅 Check-out: {check_out}",
+        f"👥 Guests: {guests}",
+        "",
+    ]
+    
+    # Add metadata if available
+    if metadata.get("title"):
+        parts.append(f"📄 Page: {metadata['title']}")
+    
+    parts += [
+        "",
+        "--- Extracted Content ---",
+        content,  # already trimmed by firecrawl_scrape
+        "",
+        f"🔗 Full details: {url}",
+    ]
+    
+    return "\n".join(parts)
 
-load_dotenv()
 
 @tool
 def search_hotels(
@@ -25,44 +67,18 @@ def search_hotels(
     Returns:
         Formatted hotel information from Kayak
     """
+    error = check_dates(check_in, check_out)
+    if error:
+        return error
+
     try:
-        # Build Kayak URL
-        location_clean = location.replace(" ", "-")
-        url = f"https://www.kayak.com/hotels/{location_clean}/{check_in}/{check_out}/{guests}adults"
+        url = build_hotels_url(location, check_in, check_out, guests)
         
         logger.info(f"Scraping Kayak hotels: {url}")
         
-        # Use FireCrawlLoader from LangChain
-        loader = FireCrawlLoader(
-            api_key=os.getenv("FIRECRAWL_API_KEY"),
-            url=url,
-            mode="scrape"
-        )
-        
-        docs = loader.load()
-        
-        if not docs:
-            return f"❌ Could not fetch hotel data from Kayak for {location}"
-        
-        doc = docs[0]
-        content = doc.page_content
-        metadata = doc.metadata
-        
-        # Format output
-        output = f"🏨 *Hotels in {location}*\n"
-        output += f"📅 Check-in: {check_in}\n"
-        output += f"📅 Check-out: {check_out}\n"
-        output += f"👥 Guests: {guests}\n\n"
-        
-        # Add metadata if available
-        if metadata.get("title"):
-            output += f"📄 Page: {metadata['title']}\n"
-        
-        output += f"\n--- Extracted Content ---\n"
-        output += f"{content[:2500]}\n\n"  # Limit content
-        output += f"🔗 Full details: {url}"
+        content, metadata = run(firecrawl_scrape(url))
         
-        return output
+        return format_hotels(location, check_in, check_out, guests, url, content, metadata)
         
     except Exception as e:
         logger.error(f"Error scraping hotels: {e}")
@@ -0,0 +1,115 @@
+import asyncio
+import atexit
+import random
+import threading
+import aiohttp
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import uvloop  # faster socket dispatch for the tool loop
+except ImportError:  # not available on Windows: fall back to the stdlib loop
+    uvloop = None
+
+# ==========================
+# SHARED ASYNC HTTP CLIENT
+# ==========================
+# The agent calls tools synchronously (several at once from ToolNode's thread
+# pool), so tool I/O runs as coroutines on one background event loop that owns
+# a single pooled aiohttp session. Concurrent tool calls then overlap on the
+# same keep-alive connections instead of each opening its own.
+
+_loop = None
+_loop_lock = threading.Lock()
+_session = None
+
+# Blocking tool work (yfinance) runs here rather than in the loop's default
+# executor, so slow calls can't hold up other run_in_executor users
+IO_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="tool-io")
+atexit.register(IO_POOL.shutdown, wait=False)
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="tool-http", daemon=True).start()
+    return _loop
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the shared session. Only call from coroutines passed to `run`."""
+    global _session
+    # Only the tool loop thread gets here, so no lock is needed
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=20,       # one upstream can't take the whole pool
+                ttl_dns_cache=300,       # skip repeat DNS lookups for the same APIs
+                keepalive_timeout=30,
+                enable_cleanup_closed=True,
+            ),
+            timeout=aiohttp.ClientTimeout(total=15),  # default for calls that don't set one
+        )
+    return _session
+
+
+# Transient upstream failures worth another try (rate limits, gateway hiccups)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_ATTEMPTS = 3
+MAX_RETRY_AFTER = 5.0  # seconds; a voice reply can't wait on a long Retry-After
+
+
+def _retry_delay(response: aiohttp.ClientResponse, attempt: int) -> float:
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None:
+        try:
+            return min(float(retry_after), MAX_RETRY_AFTER)
+        except ValueError:
+            pass  # HTTP-date form: fall back to backoff
+    return 0.3 * 2 ** attempt + random.random() * 0.1
+
+
+async def fetch_with_retry(
+    method: str,
+    url: str,
+    semaphore: asyncio.Semaphore,
+    allow_statuses=(),
+    **kwargs,
+) -> tuple[int, bytes]:
+    """
+    Send a request on the shared session, retrying RETRY_STATUSES with
+    exponential backoff and jitter (or the server's Retry-After).
+    `semaphore` bounds in-flight requests to the upstream and isn't held while waiting.
+
+    Returns:
+        (status, body). Error statuses not in `allow_statuses` raise
+        aiohttp.ClientResponseError once retries are used up.
+    """
+    session = await get_session()
+    for attempt in range(MAX_ATTEMPTS):
+        async with semaphore, session.request(method, url, **kwargs) as response:
+            if response.status not in RETRY_STATUSES or attempt == MAX_ATTEMPTS - 1:
+                if response.status not in allow_statuses:
+                    response.raise_for_status()
+                return response.status, await response.read()
+            delay = _retry_delay(response, attempt)
+        await asyncio.sleep(delay)
+
+
+def run(coro):
+    """Run a coroutine on the shared tool loop and block until it finishes."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+async def _close_session():
+    if _session is not None and not _session.closed:
+        await _session.close()
+
+
+@atexit.register
+def _shutdown():
+    if _loop is not None and _loop.is_running():
+        asyncio.run_coroutine_threadsafe(_close_session(), _loop).result(timeout=5)
+        _loop.call_soon_threadsafe(_loop.stop)
@@ -0,0 +1,63 @@
+import os
+import asyncio
+import aiohttp
+import orjson
+from dotenv import load_dotenv
+from tools.http_client import fetch_with_retry
+
+load_dotenv()
+
+# ==========================
+# FIRECRAWL SCRAPER
+# ==========================
+
+# Resolved once at import instead of on every call
+FIRECRAWL_SCRAPE_URL = "https://api.firecrawl.dev/v1/scrape"
+FIRECRAWL_API_KEY = os.getenv("FIRECRAWL_API_KEY")
+FIRECRAWL_HEADERS = {
+    "Authorization": f"Bearer {FIRECRAWL_API_KEY}",
+    "Content-Type": "application/json",
+}
+
+# Bound in-flight scrapes so a fan-out of tool calls can't trip rate limits
+FIRECRAWL_SEMAPHORE = asyncio.Semaphore(4)
+FIRECRAWL_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=3)
+
+# Tools only ever show the start of a page; keep nothing beyond this
+FIRECRAWL_MAX_CHARS = 2500
+
+async def firecrawl_scrape(url: str) -> tuple[str, dict]:
+    """
+    Scrape a page through Firecrawl's /scrape endpoint on the shared aiohttp session.
+    Several scrapes can be awaited together (e.g. with asyncio.gather).
+
+    Returns:
+        (markdown content truncated to FIRECRAWL_MAX_CHARS, page metadata);
+        content is empty if nothing was scraped.
+    """
+    if not FIRECRAWL_API_KEY:
+        raise RuntimeError("FIRECRAWL_API_KEY is not set")
+
+    payload = {
+        "url": url,
+        "formats": ["markdown"],
+        "onlyMainContent": True,  # server strips nav/footer boilerplate before sending
+        "timeout": 15000,
+    }
+
+    _, body = await fetch_with_retry(
+        "POST",
+        FIRECRAWL_SCRAPE_URL,
+        FIRECRAWL_SEMAPHORE,
+        headers=FIRECRAWL_HEADERS,
+        data=orjson.dumps(payload),
+        timeout=FIRECRAWL_TIMEOUT,
+    )
+    data = orjson.loads(body)
+    del body
+
+    page = data.get("data") or {}
+    content = (page.get("markdown") or "")[:FIRECRAWL_MAX_CHARS]
+    metadata = page.get("metadata") or {}
+    del data, page  # release the full page before it's formatted
+    return content, metadata
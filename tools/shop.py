@@ -1,12 +1,49 @@
 import os
-import json
-import requests
+import asyncio
+import aiohttp
+import orjson
 from dotenv import load_dotenv
 from langchain.tools import tool
 from loguru import logger
+from tools.cache import cached, shop_cache
+from tools.http_client import fetch_with_retry, run
 
 load_dotenv()
 
+# Resolved once at import instead of on every call
+SERPER_URL = "https://google.serper.dev/shopping"
+SERPER_API_KEY = os.getenv("SERPER_API_KEY")
+SERPER_HEADERS = {
+    'X-API-KEY': SERPER_API_KEY or "",
+    'Content-Type': 'application/json'
+}
+
+# Bound in-flight requests so a fan-out of tool calls can't trip rate limits
+SERPER_SEMAPHORE = asyncio.Semaphore(8)
+SERPER_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=3)
+
+async def fetch_shopping_results(query: str, num_results: int) -> list:
+    """Query Serper's Google Shopping endpoint over the shared aiohttp session."""
+    if not SERPER_API_KEY:
+        raise RuntimeError("SERPER_API_KEY is not set")
+    
+    payload = {
+        "q": query,
+        "num": min(num_results, 40)  # Limit to 40 max
+    }
+    
+    _, body = await fetch_with_retry(
+        "POST",
+        SERPER_URL,
+        SERPER_SEMAPHORE,
+        headers=SERPER_HEADERS,
+        data=orjson.dumps(payload),
+        timeout=SERPER_TIMEOUT,
+    )
+    data = orjson.loads(body)
+    
+    return data.get("shopping", [])
+
 @tool
 def shopping_search(query: str, num_results: int = 10) -> str:
     """
@@ -21,29 +58,17 @@ def shopping_search(query: str, num_results: int = 10) -> str:
         Formatted product information with prices, ratings, and links
     """
     try:
-        url = "https://google.serper.dev/shopping"
-        
-        payload = json.dumps({
-            "q": query,
-            "num": min(num_results, 40)  # Limit to 40 max
-        })
-        
-        headers = {
-            'X-API-KEY': os.getenv("SERPER_API_KEY"),
-            'Content-Type': 'application/json'
-        }
-        
-        response = requests.post(url, headers=headers, data=payload)
-        response.raise_for_status()
-        
-        data = response.json()
-        shopping_results = data.get("shopping", [])
+        shopping_results = cached(
+            shop_cache,
+            (query.lower().strip(), num_results),
+            lambda: run(fetch_shopping_results(query, num_results)),
+        )
         
         if not shopping_results:
             return f"❌ No products found for '{query}'."
         
-        # Format output
-        output = f"🛍️ *Shopping Results for '{query}'*\n\n"
+        # Format output (collect parts, join once)
+        parts = [f"🛍️ *Shopping Results for '{query}'*\n\n"]
         
         for idx, item in enumerate(shopping_results[:num_results], 1):
             title = item.get("title", "Unknown Product")
@@ -53,21 +78,21 @@ def shopping_search(query: str, num_results: int = 10) -> str:
             rating_count = item.get("ratingCount", 0)
             link = item.get("link", "")
             
-            output += f"{idx}. *{title}*\n"
-            output += f"   💵 Price: {price}\n"
-            output += f"   🏪 Source: {source}\n"
-            
-            if rating != "N/A":
-                output += f"   ⭐ Rating: {rating}/5 ({rating_count} reviews)\n"
-            
-            if link:
-                output += f"   🔗 {link}\n"
+            rating_line = f"   ⭐ Rating: {rating}/5 ({rating_count} reviews)\n" if rating != "N/A" else ""
+            link_line = f"   🔗 {link}\n" if link else ""
             
-            output += "\n"
+            parts.append(
+                f"{idx}. *{title}*\n"
+                f"   💵 Price: {price}\n"
+                f"   🏪 Source: {source}\n"
+                f"{rating_line}"
+                f"{link_line}"
+                "\n"
+            )
         
-        return output
+        return "".join(parts)
         
-    except requests.exceptions.RequestException as e:
+    except aiohttp.ClientError as e:
         logger.error(f"Request error in shopping search: {e}")
         return f"❌ Error connecting to shopping search API: {str(e)}"
     except Exception as e:
@@ -1,5 +1,91 @@
-import yfinance as yf
+import asyncio
 from langchain.tools import tool
+from typing import List
+from tools.cache import company_cache, get_many, put_many, stock_cache
+from tools.http_client import IO_POOL, run
+
+# ==========================
+# YFINANCE FETCHERS
+# ==========================
+
+def _last_close(data, ticker: str):
+    # group_by="ticker" gives (ticker, field) columns; older yfinance keeps a
+    # single ticker flat
+    try:
+        frame = data[ticker] if data.columns.nlevels > 1 else data
+        closes = frame["Close"].dropna()
+    except KeyError:
+        return None
+    return None if closes.empty else float(closes.iloc[-1])
+
+
+async def fetch_prices(tickers: List[str]) -> dict:
+    """Latest close per ticker from a single batched yf.download request."""
+    if not tickers:
+        return {}
+    import yfinance as yf  # pulls in pandas; only paid once a stock tool is used
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(
+        IO_POOL,
+        lambda: yf.download(tickers, period="1d", group_by="ticker", threads=True, progress=False),
+    )
+    return {ticker: _last_close(data, ticker) for ticker in tickers}
+
+
+# The only .info fields the tools read; the full payload is 100+ KB per ticker
+COMPANY_INFO_FIELDS = ("longName", "sector", "marketCap")
+
+
+def _ticker_info(ticker: str) -> dict:
+    """`.info` for one ticker, trimmed to COMPANY_INFO_FIELDS before it's cached."""
+    import yfinance as yf
+    info = yf.Ticker(ticker).info
+    return {field: info[field] for field in COMPANY_INFO_FIELDS if field in info}
+
+
+async def fetch_company_info(tickers: List[str]) -> dict:
+    """`.info` per ticker, fetched concurrently (an Exception marks a failed ticker)."""
+    loop = asyncio.get_running_loop()
+    infos = await asyncio.gather(
+        *[loop.run_in_executor(IO_POOL, _ticker_info, t) for t in tickers],
+        return_exceptions=True,
+    )
+    return dict(zip(tickers, infos, strict=True))
+
+
+async def fetch_stocks(tickers: List[str], prices: bool = True, info: bool = True):
+    """Prices and company info for `tickers`, fetched together and cached."""
+    cached_prices, missing_prices = get_many(stock_cache, tickers) if prices else ({}, [])
+    cached_info, missing_info = get_many(company_cache, tickers) if info else ({}, [])
+
+    new_prices, new_info = await asyncio.gather(
+        fetch_prices(missing_prices),
+        fetch_company_info(missing_info),
+    )
+
+    # yf.download reports network failures as missing data, not exceptions, so
+    # a None price may be transient: only cache prices that came back
+    put_many(stock_cache, {t: p for t, p in new_prices.items() if p is not None})
+    put_many(company_cache, {t: i for t, i in new_info.items() if not isinstance(i, Exception)})
+    return {**cached_prices, **new_prices}, {**cached_info, **new_info}
+
+
+def format_price(ticker: str, price) -> str:
+    if price is None:
+        return f"No stock data found for '{ticker}'."
+    return f"📈 {ticker} Current Price: {price:.2f} USD"
+
+
+def format_company_info(info: dict) -> str:
+    name = info.get("longName", "Unknown")
+    sector = info.get("sector", "Unknown")
+    mc = info.get("marketCap", "N/A")
+
+    return (
+        f"🏢 {name}\n"
+        f"• Sector: {sector}\n"
+        f"• Market Cap: {mc}\n"
+    )
 
 # ==========================
 # YFINANCE TOOLS
@@ -9,14 +95,9 @@ from langchain.tools import tool
 def get_stock_price(ticker: str) -> str:
     """Get the latest stock price for a ticker symbol like AAPL or TSLA."""
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.history(period="1d")
-
-        if info.empty:
-            return f"No stock data found for '{ticker}'."
-
-        price = info["Close"].iloc[-1]
-        return f"📈 {ticker.upper()} Current Price: {price:.2f} USD"
+        ticker = ticker.upper()
+        prices, _ = run(fetch_stocks([ticker], info=False))
+        return format_price(ticker, prices[ticker])
 
     except Exception as e:
         return f"Error fetching stock price: {str(e)}"
@@ -26,18 +107,38 @@ def get_stock_price(ticker: str) -> str:
 def get_company_info(ticker: str) -> str:
     """Get company name, sector, and market cap for a given stock ticker."""
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        ticker = ticker.upper()
+        _, infos = run(fetch_stocks([ticker], prices=False))
+        info = infos[ticker]
+        if isinstance(info, Exception):
+            raise info
+        return format_company_info(info)
 
-        name = info.get("longName", "Unknown")
-        sector = info.get("sector", "Unknown")
-        mc = info.get("marketCap", "N/A")
+    except Exception as e:
+        return f"Error fetching company info: {str(e)}"
+
+
+@tool
+def get_stocks_bulk(tickers: List[str]) -> str:
+    """
+    Get the latest price plus company name, sector, and market cap for several
+    tickers at once (e.g. ["AAPL", "MSFT", "TSLA"]). Prefer this over calling
+    the single-ticker tools repeatedly.
+    """
+    try:
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        prices, infos = run(fetch_stocks(tickers))
 
-        return (
-            f"🏢 {name}\n"
-            f"• Sector: {sector}\n"
-            f"• Market Cap: {mc}\n"
-        )
+        sections = []
+        for ticker in tickers:
+            info = infos[ticker]
+            if isinstance(info, Exception):
+                details = f"Error fetching company info: {str(info)}\n"
+            else:
+                details = format_company_info(info)
+            sections.append(f"{format_price(ticker, prices[ticker])}\n{details}")
+
+        return "\n".join(sections)
 
     except Exception as e:
-        return f"Error fetching company info: {str(e)}"
+        return f"Error fetching stock data: {str(e)}"
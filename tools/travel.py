@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Optional
+
+# ==========================
+# SHARED TRAVEL TOOL HELPERS
+# ==========================
+
+# One C-level pass over the string instead of chained .replace calls
+_URL_TRANS = str.maketrans({" ": "-", "/": "-"})
+
+
+def clean_location(location: str) -> str:
+    """Turn a city or airport name into a Kayak URL path segment."""
+    return location.translate(_URL_TRANS)
+
+
+def check_dates(*dates: Optional[str]) -> Optional[str]:
+    """
+    Return an error message for the first date not in YYYY-MM-DD format, or None.
+    Checked before scraping so a bad date fails fast instead of costing a
+    Firecrawl round trip on an invalid Kayak URL.
+    """
+    for value in dates:
+        if value is None:
+            continue
+        try:
+            # strptime alone accepts unpadded months/days, and fromisoformat
+            # accepts basic/week forms like 20250101, so pin the length too
+            if len(value) != 10:
+                raise ValueError
+            datetime.strptime(value, "%Y-%m-%d")
+        except (TypeError, ValueError):
+            return f"❌ Invalid date '{value}': use YYYY-MM-DD format"
+    return None
@@ -0,0 +1,77 @@
+import asyncio
+from langchain.tools import tool
+from loguru import logger
+from typing import Optional
+from tools.flight_tool import build_flights_url, format_flights
+from tools.hotel_tool import build_hotels_url, format_hotels
+from tools.http_client import run
+from tools.scraper import firecrawl_scrape
+from tools.travel import check_dates
+
+
+async def scrape_trip(flights_url: str, hotels_url: str) -> list:
+    """Scrape the flights and hotels pages concurrently."""
+    return await asyncio.gather(
+        firecrawl_scrape(flights_url),
+        firecrawl_scrape(hotels_url),
+        return_exceptions=True,
+    )
+
+
+@tool
+def plan_trip(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    check_in: str,
+    check_out: str,
+    return_date: Optional[str] = None,
+    guests: int = 2
+) -> str:
+    """
+    Search flights and hotels for a trip at the same time (faster than calling
+    the Flights and Hotels tools one after the other).
+    
+    Args:
+        origin: Departure city or airport code (e.g., "New York" or "JFK")
+        destination: Destination city, used for both flights and hotels (e.g., "Paris")
+        departure_date: Departure date in YYYY-MM-DD format
+        check_in: Hotel check-in date in YYYY-MM-DD format
+        check_out: Hotel check-out date in YYYY-MM-DD format
+        return_date: Optional return date in YYYY-MM-DD format for round trips
+        guests: Number of hotel guests (default: 2)
+    
+    Returns:
+        Formatted flight and hotel information from Kayak
+    """
+    error = check_dates(departure_date, return_date, check_in, check_out)
+    if error:
+        return error
+
+    try:
+        flights_url = build_flights_url(origin, destination, departure_date, return_date)
+        hotels_url = build_hotels_url(destination, check_in, check_out, guests)
+        
+        logger.info(f"Scraping Kayak trip: {flights_url} + {hotels_url}")
+        
+        flights_page, hotels_page = run(scrape_trip(flights_url, hotels_url))
+        
+        if isinstance(flights_page, Exception):
+            logger.error(f"Error scraping flights: {flights_page}")
+            flights = f"❌ Error fetching flight data: {str(flights_page)}"
+        else:
+            content, _ = flights_page
+            flights = format_flights(origin, destination, departure_date, return_date, flights_url, content)
+        
+        if isinstance(hotels_page, Exception):
+            logger.error(f"Error scraping hotels: {hotels_page}")
+            hotels = f"❌ Error fetching hotel data: {str(hotels_page)}"
+        else:
+            content, metadata = hotels_page
+            hotels = format_hotels(destination, check_in, check_out, guests, hotels_url, content, metadata)
+        
+        return f"{flights}\n\n{hotels}"
+        
+    except Exception as e:
+        logger.error(f"Error planning trip: {e}")
+        return f"❌ Error fetching trip data: {str(e)}"
@@ -1,30 +1,68 @@
 import os
+import asyncio
+import aiohttp
+import orjson
 from dotenv import load_dotenv
-from langchain_community.document_loaders import WeatherDataLoader
 from langchain.tools import tool
+from tools.cache import cached, weather_cache
+from tools.http_client import fetch_with_retry, run
 
 load_dotenv()
 
+# Resolved once at import instead of on every call
+OWM_URL = "https://api.openweathermap.org/data/2.5/weather"
+OWM_API_KEY = os.getenv("OPENWEATHERMAP_API_KEY")
+
+# Bound in-flight requests so a fan-out of tool calls can't trip rate limits
+OWM_SEMAPHORE = asyncio.Semaphore(16)
+OWM_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=3)
+
 # ==========================
 # WEATHER TOOL
 # ==========================
 
+async def fetch_weather(city: str) -> dict:
+    """Current conditions for a city from OpenWeatherMap (empty dict if unknown)."""
+    if not OWM_API_KEY:
+        raise RuntimeError("OPENWEATHERMAP_API_KEY is not set")
+
+    status, body = await fetch_with_retry(
+        "GET",
+        OWM_URL,
+        OWM_SEMAPHORE,
+        allow_statuses=(404,),
+        params={"q": city, "appid": OWM_API_KEY, "units": "metric"},
+        timeout=OWM_TIMEOUT,
+    )
+    if status == 404:
+        return {}
+    return orjson.loads(body)
+
+
+def format_weather(city: str, data: dict) -> str:
+    """Compact, voice-friendly summary of an OpenWeatherMap response."""
+    description = (data.get("weather") or [{}])[0].get("description", "unknown conditions")
+    main = data.get("main", {})
+    wind = data.get("wind", {})
+
+    return (
+        f"🌤 Weather in {city.title()}:\n"
+        f"{description.capitalize()}, {main.get('temp', 'N/A')}°C "
+        f"(feels like {main.get('feels_like', 'N/A')}°C), "
+        f"humidity {main.get('humidity', 'N/A')}%, "
+        f"wind {wind.get('speed', 'N/A')} m/s"
+    )
+
+
 @tool
 def get_weather(city: str) -> str:
     """Get current weather for a city using OpenWeatherMap."""
     try:
-        loader = WeatherDataLoader.from_params(
-            [city],
-            openweathermap_api_key=os.getenv("OPENWEATHERMAP_API_KEY")
-        )
-
-        docs = loader.load()  # returns list of Document objects
-        if not docs:
+        data = cached(weather_cache, city.lower().strip(), lambda: run(fetch_weather(city)))
+        if not data:
             return f"No weather data found for {city}."
 
-        data = docs[0].page_content  # raw text
-
-        return f"🌤 Weather in {city.title()}:\n{data}"
+        return format_weather(city, data)
 
     except Exception as e:
         return f"Error fetching weather: {str(e)}"